@@ -1,21 +1,144 @@
 import asyncio
+import functools
+import hashlib
+import os
 import sys
 import json
+import re
+import time
+from collections import OrderedDict, deque
 from urllib.parse import quote
-from typing import Optional, Dict, Any, List, Union
-from contextlib import AsyncExitStack
+from typing import Optional, Dict, Any, List, Union, Callable
+from contextlib import AsyncExitStack, asynccontextmanager
 
 from fastmcp import Client
 from fastmcp.client.elicitation import ElicitResult
 
-from anthropic import Anthropic
 from dotenv import load_dotenv
 
-load_dotenv()  # Load environment variables from .env file
+try:
+    # orjson parses and serializes JSON several times faster than the stdlib
+    import orjson
+
+    json_loads = orjson.loads
+
+    def json_dumps(obj) -> str:
+        """Encode obj as a compact JSON string."""
+        return orjson.dumps(obj).decode()
+
+    def _canonical_json(obj) -> bytes:
+        """Encode obj as JSON with sorted keys, for hashing."""
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj) -> str:
+        """Encode obj as a compact JSON string."""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+    def _canonical_json(obj) -> bytes:
+        """Encode obj as JSON with sorted keys, for hashing."""
+        return json.dumps(obj, sort_keys=True).encode()
 
 # Claude model identifier for API calls
 MODEL_ID = "claude-3-7-sonnet-20250219"
 
+# Stable agent instructions sent as a cached system prompt on every request
+SYSTEM_PROMPT = (
+    "You are an assistant working on the files of a project through the tools "
+    "of an MCP server. Use the tools when a request needs file contents or "
+    "changes, and answer directly otherwise."
+)
+
+# Whole-message small talk that never needs tools, answered without sending them
+_SMALL_TALK_RE = re.compile(
+    r"^\s*(hi|hello|hey|thanks|thank you|good (morning|afternoon|evening)|bye|goodbye)\b[\s!.,?]*$",
+    re.IGNORECASE
+)
+
+# Server script extensions accepted by connect_to_server
+_ALLOWED_EXTS = frozenset({'.py', '.ts', '.js'})
+
+# Seconds a cached prompt or resource listing stays valid
+LISTING_TTL = 60.0
+
+# Default maximum number of tool calls dispatched to the MCP server at once,
+# overridable with the MCP_TOOL_CONCURRENCY environment variable
+MAX_CONCURRENT_TOOL_CALLS = 8
+
+# Maximum number of queries processed at once by run_batch
+BATCH_CONCURRENCY = 8
+
+# Number of query responses kept in the exact-match response cache
+QUERY_CACHE_SIZE = 128
+
+# Payload size in characters above which JSON is parsed in a worker thread
+LARGE_JSON_THRESHOLD = 1_000_000
+
+# Number of most recent timing spans kept for the trace view
+TRACE_SIZE = 256
+
+# Prompt-cache breakpoint marker for Anthropic content blocks and tools
+EPHEMERAL_CACHE = {"type": "ephemeral"}
+
+# Structured-content key a tool sets to mark its output as a final answer
+TERMINATE_KEY = "terminate"
+
+
+def _to_bool(value: str) -> bool:
+    """Interpret a user-entered string as a boolean."""
+    return value.lower() in ("true", "yes", "y", "1")
+
+# Converters from user input to each JSON schema type used in elicitation
+_COERCERS = {
+    "integer": int,
+    "number": float,
+    "boolean": _to_bool,
+    "string": str,
+}
+
+def _tool_concurrency() -> int:
+    """Read the tool call concurrency limit from MCP_TOOL_CONCURRENCY.
+
+    Falls back to MAX_CONCURRENT_TOOL_CALLS, with a warning, when the value
+    is not an integer of at least 1 (a limit of 0 would block every call).
+    """
+    raw = os.environ.get("MCP_TOOL_CONCURRENCY")
+    if raw is None or not raw.strip():
+        return MAX_CONCURRENT_TOOL_CALLS
+    try:
+        limit = int(raw)
+    except ValueError:
+        limit = 0
+    if limit < 1:
+        print(
+            f"Ignoring MCP_TOOL_CONCURRENCY={raw!r}: expected an integer >= 1, "
+            f"using {MAX_CONCURRENT_TOOL_CALLS}"
+        )
+        return MAX_CONCURRENT_TOOL_CALLS
+    return limit
+
+def _coerce_json_value(value, coerce: Callable[[str], Any]):
+    """Convert a value from a JSON elicitation response with a field's coercer.
+
+    Strings go through the coercer like typed input; numbers are coerced
+    from their text form. Booleans are only accepted as JSON booleans or
+    strings, and arrays, objects and null never match a field.
+
+    Raises:
+        ValueError: If the value doesn't fit the field's type
+    """
+    if isinstance(value, str):
+        return coerce(value)
+    if coerce is _to_bool:
+        if isinstance(value, bool):
+            return value
+        raise ValueError(f"Expected a boolean, got {value!r}")
+    if value is None or isinstance(value, (dict, list)):
+        raise ValueError(f"Unexpected JSON value {value!r}")
+    return coerce(str(value))
+
+
 class MCPClient:
     """MCP (Model Context Protocol) client for interacting with MCP servers and Claude.
 
@@ -23,22 +146,106 @@ class MCPClient:
     and provides an interactive interface for querying Claude with MCP tools.
     """
 
+    # Static menu text shown on every iteration of the menu loop
+    _MENU_PROMPT = """
+Select from the Menu
+1. Generate Documentation
+2. Review Code
+3. Read File
+4. Read Current Directory
+5. Converse with Agent
+6. Show Trace
+q. Quit
+> """
+
+    # Listing icon per item type, files use the default
+    _TYPE_ICONS = {"directory": "📁"}
+
+    # Static header printed above every directory listing
+    _DIR_LISTING_HEADER = "\n".join([
+        "\nDirectory Listing:\n",
+        f"{'Type':<10} {'Size':>10} {'Modified':<25} {'Name'}",
+        "-" * 70,
+    ])
+
     def __init__(self):
         """Initialize the MCP client with session management and Anthropic API client.
 
         Sets up:
         - AsyncExitStack for managing async context managers
-        - Anthropic client for Claude API interactions
+        - Async Anthropic client on a pooled HTTP/2 connection
+        - Caches for tool, prompt and resource listings, the latter with a TTL
+        - Semaphore limiting concurrent tool calls
+        - In-memory ring buffer of timing spans
+        - LRU cache of final responses to repeated queries
+        - Menu choice to action table
         """
+        # Imported here so a client that exits early skips the SDK import cost
+        import httpx
+        from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+
         # Initialize session and LLM provider objects
         self.exit_stack = AsyncExitStack()
-        self.anthropic = Anthropic()
+        # Shared HTTP/2 connection pool reused across every Claude request
+        self.anthropic = AsyncAnthropic(
+            http_client=DefaultAsyncHttpxClient(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=32,
+                    max_keepalive_connections=16,
+                    # Keep idle connections across the user's think time between turns
+                    keepalive_expiry=60
+                )
+            )
+        )
+
+        # Cached server listings, invalidated by list_changed notifications
+        self._tools_cache: Optional[List[Dict[str, Any]]] = None
+        self._tools_cache_digest: Optional[bytes] = None
+        # Names of tools the server marks read-only (readOnlyHint); only
+        # these start early and only answers limited to them are cached
+        self._read_only_tools: frozenset[str] = frozenset()
+        # Prompt and resource listings keyed by name, with the time fetched
+        self._listing_cache: Dict[str, tuple[float, Any]] = {}
+        self._tools_lock = asyncio.Lock()
+        self._prompts_lock = asyncio.Lock()
+        self._resources_lock = asyncio.Lock()
+
+        # Bounds concurrent tool calls so the MCP server isn't overwhelmed
+        self._tool_semaphore = asyncio.Semaphore(_tool_concurrency())
+
+        # (field name, type name) pairs per elicitation response type
+        self._elicit_fields_cache: dict[type, list[tuple[str, str]]] = {}
+
+        # Timing spans for external calls, most recent last
+        self._trace: deque = deque(maxlen=TRACE_SIZE)
+
+        # Final responses keyed by (query, tool schema digest), least recent first
+        self._query_cache: OrderedDict[tuple, str] = OrderedDict()
+
+        # Strong references to background refresh tasks until they finish
+        self._background_tasks: set[asyncio.Task] = set()
+
+        # Map menu choices to async functions
+        self._menu_actions = {
+            # Documentation only needs to write its file; reviews need no tools
+            "1": functools.partial(self.prompt, "documentation_generator", tool_budget=["write_file"]),
+            "2": functools.partial(self.prompt, "code_review", tool_budget=[]),
+            "3": self.read_file,
+            "4": self.read_dir,
+            "5": self.converse,
+            "6": self.show_trace,
+            "q": self.quit_action,
+            "quit": self.quit_action
+        }
 
     async def connect_to_server(self, server_script_path: str):
         """Connect to an MCP server via stdio transport.
 
         Establishes a connection to an MCP server by launching the server script
-        as a subprocess and communicating via stdin/stdout.
+        as a subprocess and communicating via stdin/stdout, then calls
+        refresh_catalog to fetch the tool, prompt and resource listings
+        concurrently and warm their caches.
 
         Args:
             server_script_path: Path to the server script (.py, .js, or .ts file)
@@ -46,14 +253,14 @@ class MCPClient:
         Raises:
             ValueError: If server_script_path is not a .py, .js, or .ts file
         """
-        # Determine script type based on file extension
-        is_python = server_script_path.endswith('.py')
-        is_ts = server_script_path.endswith('.ts')
-        is_js = server_script_path.endswith('.js')
-
-        if not (is_python or is_ts or is_js):
+        # Validate script type based on file extension
+        ext = os.path.splitext(server_script_path)[1]
+        if ext not in _ALLOWED_EXTS:
             raise ValueError("Server script must be a .py, .js, or .ts file")
 
+        # Listings from any previous server are no longer valid
+        self.invalidate_cache()
+
         self.client = Client(
             server_script_path, 
             elicitation_handler=self.handle_elicitation,
@@ -63,11 +270,78 @@ class MCPClient:
 
         await self.exit_stack.enter_async_context(self.client)
 
+        # Warm the listing caches so the first action doesn't wait
+        await self.refresh_catalog()
+
+    @asynccontextmanager
+    async def _span(self, name: str, **meta):
+        """Time an external call and record it in the trace buffer.
+
+        Args:
+            name: Name of the traced operation
+            **meta: Extra fields stored with the span (e.g. tool name)
+        """
+        start = time.perf_counter_ns()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self._trace.append({
+                "name": name,
+                "duration_ms": (time.perf_counter_ns() - start) / 1_000_000,
+                "ok": ok,
+                **meta
+            })
+
+    async def _ainput(self, prompt: str) -> str:
+        """Read a line from stdin without blocking the event loop.
+
+        Runs the builtin input() in a worker thread so MCP progress and
+        notification handlers keep firing while the user is typing.
+
+        Args:
+            prompt: Text displayed before reading input
+
+        Returns:
+            The line entered by the user, stripped of surrounding whitespace
+        """
+        return (await asyncio.to_thread(input, prompt)).strip()
+
+    def _elicit_fields(self, response_type: type, params) -> list[tuple[str, str, Callable[[str], Any]]]:
+        """Return the fields of an elicitation schema with their input coercers.
+
+        Computed once per response type and cached. Coercers are picked from
+        the JSON schema type the server requested for each field.
+
+        Args:
+            response_type: Pydantic model defining the expected response structure
+            params: Elicitation parameters carrying the requested JSON schema
+
+        Returns:
+            List of (field name, type name, coercer) tuples in declaration order
+        """
+        fields = self._elicit_fields_cache.get(response_type)
+        if fields is None:
+            properties = (getattr(params, "requestedSchema", None) or {}).get("properties", {})
+            fields = [
+                (
+                    field_name,
+                    field_type.__name__,
+                    _COERCERS.get(properties.get(field_name, {}).get("type", "string"), str)
+                )
+                for field_name, field_type in response_type.__annotations__.items()
+            ]
+            self._elicit_fields_cache[response_type] = fields
+        return fields
+
     async def handle_elicitation(self, message: str, response_type: type, params, context):
         """Handle elicitation requests from the MCP server.
 
         When the server needs user input, this handler prompts the user,
         collects their response, and returns it in the expected format.
+        Multi-field responses can be entered at once as a JSON object;
+        otherwise each field is prompted for separately.
 
         Args:
             message: The question or prompt from the server
@@ -80,13 +354,41 @@ class MCPClient:
         """
         print(f"Server asks: {message}")
 
-        user_data = {}
-        for field_name, field_type in response_type.__annotations__.items():
-            user_input = input(f"Enter value for '{field_name}' ({field_type.__name__}): ").strip()
-            if not user_input:
-                return ElicitResult(action="decline")
+        fields = self._elicit_fields(response_type, params)
+
+        # Collect multi-field responses in a single read when given as JSON
+        if len(fields) > 1:
+            print("Fields: " + ", ".join(
+                f"{field_name} ({type_name})" for field_name, type_name, _ in fields
+            ))
+            raw = await self._ainput("Enter values as a JSON object (leave blank to enter each field): ")
+            if raw:
+                try:
+                    user_data = json_loads(raw)
+                    # The object must provide exactly the requested fields
+                    if isinstance(user_data, dict) and user_data.keys() == {f[0] for f in fields}:
+                        # Every value goes through the same coercers as typed input
+                        for field_name, _, coerce in fields:
+                            user_data[field_name] = _coerce_json_value(user_data[field_name], coerce)
+                        return response_type(**user_data)
+                except (ValueError, TypeError):
+                    # Covers JSON decode errors, failed coercions and values the
+                    # response type rejects
+                    pass
+                print("Could not parse a JSON object with those fields - enter each field instead")
 
-            user_data[field_name] = user_input
+        user_data = {}
+        for field_name, type_name, coerce in fields:
+            while True:
+                user_input = await self._ainput(f"Enter value for '{field_name}' ({type_name}): ")
+                if not user_input:
+                    return ElicitResult(action="decline")
+
+                try:
+                    user_data[field_name] = coerce(user_input)
+                    break
+                except ValueError:
+                    print(f"Invalid {type_name} value for '{field_name}', please try again")
 
         # Return the structured response object
         return response_type(**user_data)
@@ -116,77 +418,377 @@ class MCPClient:
         Args:
             message: MCP notification message from the server
         """
-        if hasattr(message, 'root'):
-            method = message.root.method
+        root = getattr(message, 'root', None)
+        if root is not None:
+            method = root.method
             print(f"Received: {method}")
 
             if method == "notifications/tools/list_changed":
-                print("Tools have changed - might want to refresh tool cache")
+                print("Tools have changed - refreshing tool cache")
+                self._tools_cache = None
+            elif method == "notifications/prompts/list_changed":
+                print("Prompts have changed")
+                self._listing_cache.pop("prompts", None)
+                self._schedule_listings_refresh()
             elif method == "notifications/resources/list_changed":
                 print("Resources have changed")
+                self._listing_cache.pop("resources", None)
+                self._listing_cache.pop("resource_templates", None)
+                self._schedule_listings_refresh()
 
 
 
+    def invalidate_cache(self):
+        """Drop all cached tool, prompt and resource listings.
+
+        The next access fetches fresh listings from the server.
+        """
+        self._tools_cache = None
+        self._listing_cache.clear()
+
+    async def refresh_catalog(self):
+        """Re-fetch every tool, prompt and resource listing from the server.
+
+        The tool listing and _refresh_listings run concurrently, so all four
+        list calls are in flight at once. Listings that fail are left
+        uncached and fetched lazily on next use.
+        """
+        self._tools_cache = None
+        await asyncio.gather(
+            self._get_tools(),
+            self._refresh_listings(),
+            return_exceptions=True
+        )
+
+    async def _refresh_listings(self):
+        """Re-fetch prompt, resource and resource template listings.
+
+        Unlike refresh_catalog, the tool listing is left alone. The three
+        list calls are issued concurrently so a refresh costs one round-trip.
+        Failures are swallowed rather than raised: listings that fail are
+        left uncached and fetched lazily on next use.
+        """
+        async with self._span("mcp.refresh_listings"):
+            prompts, resources, resource_templates = await asyncio.gather(
+                self.client.list_prompts(),
+                self.client.list_resources(),
+                self.client.list_resource_templates(),
+                return_exceptions=True
+            )
+
+        if not isinstance(prompts, BaseException):
+            self._store_listing("prompts", prompts)
+        if not isinstance(resources, BaseException):
+            self._store_listing("resources", resources)
+        if not isinstance(resource_templates, BaseException):
+            self._store_listing("resource_templates", resource_templates)
+
+    def _schedule_listings_refresh(self):
+        """Refresh the prompt and resource listings in the background.
+
+        Runs _refresh_listings (tools are not re-fetched). Used from the
+        message handler, which must return promptly rather than wait on
+        further requests to the server.
+        """
+        task = asyncio.create_task(self._refresh_listings())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
     async def _get_tools(self) -> List[Dict[str, Any]]:
         """Retrieve available tools from the MCP server.
 
         Fetches the list of tools exposed by the server and formats them
-        for use with the Claude API.
+        for use with the Claude API, marking the last tool as a prompt-cache
+        breakpoint. The result is cached until the server sends a tools
+        list_changed notification. Tools annotated with readOnlyHint are
+        recorded in _read_only_tools.
 
         Returns:
             List of tool definitions with name, description, and input schema
         """
-        tools_response = await self.client.list_tools()
-        # Format tools for Claude API compatibility
-        tools = [
-            {
-                "name": tool.name,
-                "description": tool.description or "MCP Tool",
-                "input_schema": tool.inputSchema,
-            }
-            for tool in tools_response
-        ]
-        
-        return tools
+        if self._tools_cache is not None:
+            return self._tools_cache
+
+        async with self._tools_lock:
+            # Another caller may have populated the cache while we waited
+            if self._tools_cache is None:
+                async with self._span("mcp.list_tools"):
+                    tools_response = await self.client.list_tools()
+                # Format tools for Claude API compatibility, sorted by name so
+                # the prompt-cache prefix doesn't depend on server ordering
+                self._tools_cache = [
+                    {
+                        "name": tool.name,
+                        "description": tool.description or "MCP Tool",
+                        "input_schema": tool.inputSchema,
+                    }
+                    for tool in sorted(tools_response, key=lambda tool: tool.name)
+                ]
+                # Cache breakpoint on the last tool caches the whole tool prefix
+                if self._tools_cache:
+                    self._tools_cache[-1]["cache_control"] = EPHEMERAL_CACHE
+                self._tools_cache_digest = self._tools_digest(self._tools_cache)
+                self._read_only_tools = frozenset(
+                    tool.name for tool in tools_response
+                    if tool.annotations is not None and tool.annotations.readOnlyHint
+                )
+
+        return self._tools_cache
+
+    def _cached_listing(self, key: str):
+        """Return a cached listing if it is younger than LISTING_TTL.
+
+        Args:
+            key: Listing name ("prompts", "resources" or "resource_templates")
+
+        Returns:
+            The cached listing, or None if missing or expired
+        """
+        entry = self._listing_cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < LISTING_TTL:
+            return entry[1]
+        return None
+
+    def _store_listing(self, key: str, listing):
+        """Cache a listing with the current timestamp.
+
+        Args:
+            key: Listing name ("prompts", "resources" or "resource_templates")
+            listing: Listing returned by the server
+        """
+        self._listing_cache[key] = (time.monotonic(), listing)
+
+    async def _get_listing(self, key: str, fetch: Callable, lock: asyncio.Lock):
+        """Return a listing from the cache, fetching it from the server if needed.
+
+        Args:
+            key: Listing name ("prompts", "resources" or "resource_templates")
+            fetch: Client coroutine function that lists the items
+            lock: Lock ensuring only one fetch for the listing is in flight
+
+        Returns:
+            The cached or freshly fetched listing
+        """
+        listing = self._cached_listing(key)
+        if listing is not None:
+            return listing
+
+        async with lock:
+            # Another caller may have populated the cache while we waited
+            listing = self._cached_listing(key)
+            if listing is None:
+                async with self._span(f"mcp.list_{key}"):
+                    listing = await fetch()
+                self._store_listing(key, listing)
+
+        return listing
 
     async def _get_prompts(self):
         """Retrieve available prompts from the MCP server.
 
+        The result is cached for LISTING_TTL seconds or until the server
+        sends a prompts list_changed notification.
+
         Returns:
             PromptsResponse containing available prompt templates
         """
-        
-        prompts_response = await self.client.list_prompts()
-        
-        return prompts_response
+        return await self._get_listing("prompts", self.client.list_prompts, self._prompts_lock)
 
     async def _get_resources(self):
         """Retrieve available resources from the MCP server.
 
+        The result is cached for LISTING_TTL seconds or until the server
+        sends a resources list_changed notification.
+
         Returns:
             ResourcesResponse containing available resources
         """
-        resources_response = await self.client.list_resources()
-        return resources_response
+        return await self._get_listing("resources", self.client.list_resources, self._resources_lock)
 
     async def _get_resource_templates(self):
         """Retrieve available resource templates from the MCP server.
 
+        The result is cached for LISTING_TTL seconds or until the server
+        sends a resources list_changed notification.
+
         Returns:
             ResourceTemplatesResponse containing available resource templates
         """
-        resource_templates_response = await self.client.list_resource_templates()
-        return resource_templates_response
+        return await self._get_listing(
+            "resource_templates", self.client.list_resource_templates, self._resources_lock
+        )
+
+    @staticmethod
+    def _format_result(result) -> str:
+        """Flatten a tool call result into text for a tool_result block.
+
+        Args:
+            result: Result returned by the MCP client's call_tool
+
+        Returns:
+            Text parts joined by newlines, with non-text parts stringified
+        """
+        if isinstance(result.content, list):
+            return "\n".join(
+                text if (text := getattr(c, 'text', None)) is not None else str(c)
+                for c in result.content
+            )
+        return result.content
+
+    async def _call_tool(self, content) -> tuple[Dict[str, Any], bool]:
+        """Execute a single tool_use block and build its tool_result.
+
+        Errors are captured in the returned block so that one failing tool
+        doesn't cancel sibling calls dispatched in the same turn.
+
+        Args:
+            content: tool_use content block from Claude's response
+
+        Returns:
+            Tuple of the tool_result content block matching the tool_use id,
+            and whether the tool flagged its output as a final answer
+        """
+        tool_name = content.name
+        tool_args = content.input
+
+        try:
+            # Call the tool via MCP session
+            async with self._tool_semaphore, self._span("mcp.call_tool", tool=tool_name):
+                result = await self.client.call_tool(tool_name, tool_args)
 
-    async def process_query(self, query: str) -> str:
+            # Tools opt in to ending the loop via their structured output
+            structured = getattr(result, "structured_content", None)
+            terminate = isinstance(structured, dict) and structured.get(TERMINATE_KEY) is True
+
+            return {
+                "type": "tool_result",
+                "tool_use_id": content.id,
+                "content": self._format_result(result)
+            }, terminate
+
+        except Exception as e:
+            # Handle tool execution errors
+            print(f"Error calling tool {tool_name}: {e}")
+            return {
+                "type": "tool_result",
+                "tool_use_id": content.id,
+                "content": f"Error: {str(e)}",
+                "is_error": True
+            }, False
+
+    async def _stream_message(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: List[Dict[str, Any]],
+        on_tool_use: Optional[Callable[[Any], None]] = None,
+        echo: bool = True
+    ):
+        """Send the conversation to Claude and stream the reply to stdout.
+
+        Text deltas are printed as they arrive so the user sees output before
+        generation finishes, while the event loop stays free to dispatch MCP
+        notifications. Each tool_use block is handed to on_tool_use as soon as
+        it is complete, so tools can start before the message finishes.
+
+        Args:
+            messages: Conversation history to send
+            tools: Tool definitions available to Claude
+            on_tool_use: Optional callback receiving each completed tool_use block
+            echo: Whether to print text deltas as they arrive
+
+        Returns:
+            The final assembled Message, including stop_reason and content blocks
+        """
+        async with self._span("anthropic.messages.stream", turn=len(messages)):
+            async with self.anthropic.messages.stream(
+                model=MODEL_ID,
+                max_tokens=4096,
+                # Cached together with the tool definitions that precede it
+                system=[{"type": "text", "text": SYSTEM_PROMPT, "cache_control": EPHEMERAL_CACHE}],
+                messages=messages,
+                # An empty tool list is omitted from the request entirely
+                **({"tools": tools} if tools else {})
+            ) as stream:
+                streamed_text = False
+                async for event in stream:
+                    if event.type == "text":
+                        if echo:
+                            print(event.text, end="", flush=True)
+                            streamed_text = True
+                    elif (
+                        event.type == "content_block_stop"
+                        and event.content_block.type == "tool_use"
+                        and on_tool_use is not None
+                    ):
+                        on_tool_use(event.content_block)
+                if streamed_text:
+                    print()
+
+                return await stream.get_final_message()
+
+    @staticmethod
+    def _tools_digest(tools: List[Dict[str, Any]]) -> bytes:
+        """Hash tool definitions so responses are only reused for identical tools.
+
+        Args:
+            tools: Tool definitions offered to Claude
+
+        Returns:
+            Digest of the canonical JSON encoding of the definitions
+        """
+        return hashlib.blake2b(_canonical_json(tools), digest_size=16).digest()
+
+    def _set_cache_breakpoints(self, messages: List[Dict[str, Any]]):
+        """Mark the last two user turns as prompt-cache breakpoints.
+
+        Caching the conversation prefix at the latest user turn, plus the one
+        before it so the previous request's cache entry is still read, means
+        each loop iteration only processes the newest turn. The breakpoint is
+        removed from the older turn it replaces to stay within Anthropic's
+        limit of four (tools, system prompt and these two).
+
+        Args:
+            messages: Conversation history, modified in place
+        """
+        user_turns = 0
+        for message in reversed(messages):
+            if message["role"] != "user":
+                continue
+
+            # Breakpoints need content blocks rather than a plain string
+            if isinstance(message["content"], str):
+                message["content"] = [{"type": "text", "text": message["content"]}]
+
+            user_turns += 1
+            if user_turns <= 2:
+                message["content"][-1]["cache_control"] = EPHEMERAL_CACHE
+            else:
+                # Older turns were cleared on previous iterations
+                message["content"][-1].pop("cache_control", None)
+                break
+
+    async def process_query(
+        self,
+        query: str,
+        tool_budget: Optional[List[str]] = None,
+        echo: bool = True
+    ) -> str:
         """Process a query using Claude with access to MCP server tools.
 
         Implements an agentic loop where Claude can use MCP tools to answer
         the query. The loop continues until Claude provides a final response
-        without requesting further tool use.
+        without requesting further tool use, or until every tool called in a
+        turn sets `terminate` in its structured output, in which case the tool
+        outputs are returned directly. Claude's text is streamed to stdout as
+        it is generated. Answers that used only read-only tools are cached
+        and replayed for identical queries.
 
         Args:
             query: The user's query to process
+            tool_budget: Names of the tools Claude may use. None offers every
+                server tool, except for small talk; an empty list sends no
+                tools and skips listing them
+            echo: Whether to print the response to stdout as it is produced
 
         Returns:
             The final text response from Claude
@@ -199,83 +801,146 @@ class MCPClient:
             }
         ]
 
-        # Fetch available tools from MCP server
-        available_tools = await self._get_tools()
-
-        # Initial Claude API call with tools
-        response = self.anthropic.messages.create(
-            model=MODEL_ID,
-            max_tokens=4096,
-            messages=messages,
-            tools=available_tools
-        )
+        # Greetings and thanks are answered without the tool definitions
+        if tool_budget is None and _SMALL_TALK_RE.match(query):
+            tool_budget = []
+
+        # Fetch available tools from MCP server, restricted to the budget
+        if tool_budget is None:
+            available_tools = await self._get_tools()
+        elif tool_budget:
+            available_tools = [t for t in await self._get_tools() if t["name"] in tool_budget]
+            # Keep a cache breakpoint on the last tool actually sent
+            if available_tools:
+                available_tools[-1] = {**available_tools[-1], "cache_control": EPHEMERAL_CACHE}
+        else:
+            available_tools = []
 
-        # Agentic loop - continue while Claude requests tool use
-        while response.stop_reason == "tool_use":
-            # Add Claude's response (including tool use requests) to conversation
-            messages.append({
-                "role": "assistant",
-                "content": response.content
-            })
+        # Replay the answer to an identical earlier query with the same tools
+        if available_tools is self._tools_cache:
+            tools_digest = self._tools_cache_digest
+        else:
+            tools_digest = self._tools_digest(available_tools)
+        cache_key = (query, tools_digest)
+        cached = self._query_cache.get(cache_key)
+        if cached is not None:
+            self._query_cache.move_to_end(cache_key)
+            if echo:
+                print(cached)
+            return cached
+
+        # Tools the server marked read-only when the tool list was fetched
+        read_only_tools = self._read_only_tools
+
+        # Names of every tool Claude called while answering
+        called_tools: set[str] = set()
+        final_text = None
+
+        # Tool calls started while Claude's response is still streaming
+        tool_tasks: Dict[str, asyncio.Task] = {}
+
+        def start_tool(block):
+            # Only tools the server marks read-only may start before the turn
+            # is known to end in tool_use, since a failed or truncated stream
+            # can't undo a side effect
+            if block.name not in read_only_tools:
+                return
+            called_tools.add(block.name)
+            tool_tasks[block.id] = asyncio.create_task(self._call_tool(block))
 
-            # Execute all requested tool calls
-            tool_results = []
-            for content in response.content:
-                if content.type == 'tool_use':
-                    tool_name = content.name
-                    tool_args = content.input
-
-                    try:
-                        # Call the tool via MCP session
-                        result = await self.client.call_tool(tool_name, tool_args)
-
-                        # Format result content
-                        if isinstance(result.content, list):
-                            result_text = "\n".join([
-                                c.text if hasattr(c, 'text') else str(c)
-                                for c in result.content
-                            ])
-                        else:
-                            result_text = result.content
-
-                        tool_results.append({
-                            "type": "tool_result",
-                            "tool_use_id": content.id,
-                            "content": result_text
-                        })
-
-                    except Exception as e:
-                        # Handle tool execution errors
-                        print(f"Error calling tool {tool_name}: {e}")
-                        tool_results.append({
-                            "type": "tool_result",
-                            "tool_use_id": content.id,
-                            "content": f"Error: {str(e)}",
-                            "is_error": True
-                        })
-
-            # Add tool results to conversation
-            messages.append({
-                "role": "user",
-                "content": tool_results
-            })
+        # Model and tools are invariant for the whole loop, so bind them once
+        send_message = functools.partial(
+            self._stream_message, tools=available_tools, on_tool_use=start_tool, echo=echo
+        )
 
-            # Get next response from Claude
-            response = self.anthropic.messages.create(
-                model=MODEL_ID,
-                max_tokens=4096,
-                messages=messages,
-                tools=available_tools
+        try:
+            # Initial Claude API call with tools
+            self._set_cache_breakpoints(messages)
+            response = await send_message(messages)
+
+            # Agentic loop - continue while Claude requests tool use
+            while response.stop_reason == "tool_use":
+                # Add Claude's response (including tool use requests) to conversation
+                messages.append({
+                    "role": "assistant",
+                    "content": response.content
+                })
+
+                # Collect tool calls in order, most already running since the stream
+                tool_uses = [c for c in response.content if c.type == 'tool_use']
+                called_tools.update(c.name for c in tool_uses)
+                calls = [tool_tasks.pop(c.id, None) or self._call_tool(c) for c in tool_uses]
+                if len(calls) == 1:
+                    # Common single-call turn needs no gather scheduling
+                    outcomes = [await calls[0]]
+                else:
+                    outcomes = await asyncio.gather(*calls)
+                tool_results = [block for block, _ in outcomes]
+
+                # Skip the follow-up Claude call when every tool gave a final answer
+                if outcomes and all(terminate for _, terminate in outcomes):
+                    final_text = "\n".join(block["content"] for block in tool_results)
+                    if echo:
+                        print(final_text)
+                    break
+
+                # Add tool results to conversation
+                messages.append({
+                    "role": "user",
+                    "content": tool_results
+                })
+
+                # Get next response from Claude, caching the conversation so far
+                self._set_cache_breakpoints(messages)
+                response = await send_message(messages)
+        finally:
+            # Don't leave tool calls running if the query failed mid-turn, and
+            # wait for them to unwind before returning
+            if tool_tasks:
+                for task in tool_tasks.values():
+                    task.cancel()
+                await asyncio.gather(*tool_tasks.values(), return_exceptions=True)
+
+        if final_text is None:
+            # Extract final text response from Claude
+            final_text = "\n".join(
+                text for c in response.content
+                if (text := getattr(c, 'text', None)) is not None
             )
 
-        # Extract final text response from Claude
-        final_text = []
-        for content in response.content:
-            if hasattr(content, 'text'):
-                final_text.append(content.text)
+        # Only answers that didn't change anything are safe to replay
+        if called_tools <= read_only_tools:
+            self._query_cache[cache_key] = final_text
+            if len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
 
-        return "\n".join(final_text)
+        return final_text
     
+    async def run_batch(self, queries: List[str], concurrency: int = BATCH_CONCURRENCY) -> List[str]:
+        """Process several independent queries concurrently.
+
+        Responses are not streamed to stdout since concurrent queries would
+        interleave. A failing query yields an error string instead of
+        aborting the batch.
+
+        Args:
+            queries: Queries to process
+            concurrency: Maximum number of queries in flight at once
+
+        Returns:
+            Final responses in the same order as queries
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_one(query: str) -> str:
+            async with semaphore:
+                try:
+                    return await self.process_query(query, echo=False)
+                except Exception as e:
+                    return f"Error: {type(e).__name__}: {e}"
+
+        return await asyncio.gather(*[run_one(query) for query in queries])
+
     async def converse(self):
         """Start an interactive conversation mode with Claude.
 
@@ -285,7 +950,7 @@ class MCPClient:
         print("\nEntering conversation mode. Type 'quit' or 'q' to exit.")
 
         while True:
-            query = input("\nQuery: ").strip()
+            query = await self._ainput("\nQuery: ")
 
             if query.lower() in ("quit", "q"):
                 break  # Signal exit
@@ -295,13 +960,14 @@ class MCPClient:
                 continue
 
             try:
-                response = await self.process_query(query)
-                print("\n" + response)
+                print()
+                # Response text is streamed to stdout by process_query
+                await self.process_query(query)
             except Exception as e:
                 print(f"Error processing query: {e}")
         return
     
-    async def prompt(self, prompt_name: str):
+    async def prompt(self, prompt_name: str, tool_budget: Optional[List[str]] = None):
         """Execute a named prompt template from the MCP server.
 
         Retrieves a prompt template from the server, collects required arguments
@@ -309,6 +975,7 @@ class MCPClient:
 
         Args:
             prompt_name: Name of the prompt template to execute
+            tool_budget: Names of the tools Claude may use, passed to process_query
         """
         try:
             # Fetch available prompts from server
@@ -329,7 +996,7 @@ class MCPClient:
             if prompt_obj.arguments:
                 for arg in prompt_obj.arguments:
                     required = "required" if arg.required else "optional"
-                    user_input = input(f"{arg.name} ({required}): ").strip()
+                    user_input = await self._ainput(f"{arg.name} ({required}): ")
 
                     # Validate required arguments
                     if not user_input and arg.required:
@@ -345,8 +1012,8 @@ class MCPClient:
             prompt = prompt_result.messages[0].content.text
 
             # Process the generated prompt with Claude
-            response = await self.process_query(prompt)
-            print(response)
+            # Response text is streamed to stdout by process_query
+            await self.process_query(prompt, tool_budget=tool_budget)
         except Exception as e:
             print(f"Error: {type(e).__name__}: {e}\n")
             return
@@ -359,13 +1026,15 @@ class MCPClient:
         through the MCP server's file resource.
         """
         try:
-            file_name = input("Enter file path: ").strip()
+            file_name = await self._ainput("Enter file path: ")
             encoded_file_name = quote(file_name, safe="")
-            # Access file resource using file:/// URI scheme
-            resource = await self.client.read_resource(f"file:///{encoded_file_name}")
-            file_content = json.loads(resource[0].text)["file_content"]
+            # Raw file resource returns the content itself, no JSON to decode
+            resource = await self.client.read_resource(f"file-raw:///{encoded_file_name}")
+            file_content = resource[0].text
 
-            print(f"File Content:\n {file_content}")
+            # Print separately to avoid copying a large file into a new string
+            print("File Content:")
+            print(file_content)
             return file_content
         except Exception as e:
             print(f"Error reading file: {e}")
@@ -376,31 +1045,74 @@ class MCPClient:
         Args:
             items: List of directory items with metadata (type, size, modified, name)
         """
-        print("\nDirectory Listing:\n")
-        print(f"{'Type':<10} {'Size':>10} {'Modified':<25} {'Name'}")
-        print("-" * 70)
+        # Build the whole listing first and emit it with a single write
+        lines = [self._DIR_LISTING_HEADER]
         for item in items:
             # Add icon based on item type
-            type_icon = "📁" if item["type"] == "directory" else "📄"
+            type_icon = self._TYPE_ICONS.get(item["type"], "📄")
             size = f"{item['size']} B"
-            print(f"{type_icon:<2} {item['type']:<8} {size:>10}  {item['modified']:<25} {item['name']}")
+            lines.append(f"{type_icon:<2} {item['type']:<8} {size:>10}  {item['modified']:<25} {item['name']}")
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
+    async def _parse_json(self, text: str):
+        """Parse a JSON resource payload, off the event loop when it is large.
+
+        Args:
+            text: JSON text to parse
+
+        Returns:
+            The decoded JSON value
+        """
+        if len(text) > LARGE_JSON_THRESHOLD:
+            return await asyncio.to_thread(json_loads, text)
+        return json_loads(text)
+
     async def read_dir(self):
         """List the contents of the current directory via MCP resource.
 
         Retrieves and displays directory contents through the MCP server's
-        directory resource.
+        paged directory resource, so no single response has to hold a large
+        directory.
         """
         try:
-            # Access directory resource using dir:// URI scheme
-            resource = await self.client.read_resource(f"dir://.")
-            dir_list = json.loads(resource[0].text)["items"]
+            # Access directory resource pages using dir:// URI scheme
+            dir_list = []
+            page = 0
+            while page is not None:
+                resource = await self.client.read_resource(f"dir://./page/{page}")
+                listing = await self._parse_json(resource[0].text)
+                dir_list.extend(listing["items"])
+                page = listing["next_page"]
             self._print_dir_listing(dir_list)
             return
         except Exception as e:
             print(f"Error reading directory: {e}")
 
+    async def show_trace(self):
+        """Print the recorded timing spans, oldest first.
+
+        Shows how long each Claude request, MCP tool call and listing call
+        took so latency can be attributed to the right component.
+        """
+        if not self._trace:
+            print("No trace recorded yet")
+            return
+
+        lines = [
+            "\nTrace:\n",
+            f"{'Operation':<32} {'Duration':>12}  {'Status':<6} {'Details'}",
+            "-" * 70,
+        ]
+        for span in self._trace:
+            details = ", ".join(
+                f"{key}={value}" for key, value in span.items()
+                if key not in ("name", "duration_ms", "ok")
+            )
+            status = "ok" if span["ok"] else "error"
+            lines.append(f"{span['name']:<32} {span['duration_ms']:>9.1f} ms  {status:<6} {details}")
+        sys.stdout.write("\n".join(lines) + "\n")
+
     async def menu(self):
         """Run the main interactive chat loop with menu-driven interface.
 
@@ -410,29 +1122,10 @@ class MCPClient:
         print("\nMCP Client Started!")
         print("Select from the menu or 'quit'/'q' to exit.")
 
-        # Map menu choices to async functions
-        menu_actions = {
-            "1": lambda: self.prompt("documentation_generator"),
-            "2": lambda: self.prompt("code_review"),
-            "3": self.read_file,
-            "4": self.read_dir,
-            "5": self.converse,
-            "q": self.quit_action,
-            "quit": self.quit_action
-        }
-
         while True:
-            choice = input("""
-Select from the Menu
-1. Generate Documentation
-2. Review Code
-3. Read File
-4. Read Current Directory
-5. Converse with Agent
-q. Quit
-> """).strip()
+            choice = await self._ainput(self._MENU_PROMPT)
 
-            action = menu_actions.get(choice)
+            action = self._menu_actions.get(choice)
 
             if not action:
                 print("Invalid choice. Please try again.")
@@ -455,16 +1148,30 @@ q. Quit
         """Clean up resources and close connections.
 
         Closes the async exit stack which manages all open connections
-        and resources.
+        and resources, then the Anthropic client's HTTP connection pool.
         """
         if self.exit_stack:
             await self.exit_stack.aclose()
+        await self.anthropic.close()
+
+def _load_env():
+    """Load environment variables (e.g. ANTHROPIC_API_KEY) from a .env file."""
+    load_dotenv()
+
+def _load_batch(batch_path: str) -> List[str]:
+    """Read queries from a JSON Lines file with one {"query": ...} object per line."""
+    with open(batch_path, encoding="utf-8") as f:
+        return [json_loads(line)["query"] for line in f if line.strip()]
 
 async def main():
     # Check correct usage
-    if len(sys.argv) < 2:
-        print("Usage: python client.py <server_path>")
+    if len(sys.argv) not in (2, 4) or (len(sys.argv) == 4 and sys.argv[2] != "--batch"):
+        print("Usage: python client.py <server_path> [--batch <queries.jsonl>]")
         sys.exit(1)
+    batch_path = sys.argv[3] if len(sys.argv) == 4 else None
+
+    # Must run before MCPClient reads the API key from the environment
+    _load_env()
 
     client = MCPClient()
     try:
@@ -473,7 +1180,14 @@ async def main():
 
         await client.connect_to_server(server_path)
 
-        await client.menu()
+        if batch_path:
+            # Process every query in the file and print one JSON line per result
+            queries = _load_batch(batch_path)
+            responses = await client.run_batch(queries)
+            for query, response in zip(queries, responses):
+                print(json_dumps({"query": query, "response": response}))
+        else:
+            await client.menu()
     except Exception as e:
         print(f"Error: {type(e).__name__}: {e}")
     finally:
@@ -481,4 +1195,10 @@ async def main():
         await client.cleanup()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # Prefer the libuv-based event loop when it's installed (POSIX only)
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
\ No newline at end of file
@@ -1,13 +1,67 @@
+import asyncio
+import os
+import shutil
+import stat
+import time
+from collections import OrderedDict
+from itertools import islice
 from pathlib import Path
+from typing import Iterator
 from pydantic import BaseModel
 from datetime import datetime
-import time
 
 from fastmcp import FastMCP, Context
 
 # Project root directory (current working directory)
 BASE_DIR = Path.cwd()
 
+# BASE_DIR as a string, and the prefix every path inside it starts with
+BASE_DIR_STR = str(BASE_DIR)
+BASE_DIR_PREFIX = os.path.join(BASE_DIR_STR, "")
+
+# BASE_DIR with symlinks resolved, for checking where a path really points
+BASE_DIR_REAL = os.path.realpath(BASE_DIR_STR)
+
+# Encoded content size in bytes above which write_file writes in chunks and
+# reports progress
+PROGRESS_WRITE_THRESHOLD = 1 << 20
+
+# Whether os.scandir accepts a directory file descriptor (POSIX only)
+SCANDIR_FD = os.scandir in os.supports_fd
+
+# Number of entries returned per page by the paged directory listing
+LISTING_PAGE_SIZE = 200
+
+# Flags for opening files to read; O_NOATIME (Linux only) skips the
+# access-time update but is only permitted for the file's owner
+READ_FLAGS = os.O_RDONLY | getattr(os, "O_CLOEXEC", 0)
+NOATIME_FLAG = getattr(os, "O_NOATIME", 0)
+
+# Flags for opening files to write, matching open(path, "w") without the
+# buffered file object
+WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0)
+
+# Bytes requested per os.copy_file_range call when copying files
+COPY_CHUNK_SIZE = 1 << 30
+
+# Maximum number of paths kept in the stat cache
+STAT_CACHE_SIZE = 10_000
+
+# Seconds a cached stat result (or a missing path) is trusted before the
+# filesystem is checked again, to pick up changes made outside the server
+STAT_CACHE_TTL = 2.0
+
+# LRU of path -> (time cached, stat result or None for a missing path)
+_stat_cache: OrderedDict[str, tuple[float, os.stat_result | None]] = OrderedDict()
+
+# Maximum number of decoded files kept in the content cache, and the largest
+# file size (in bytes) worth keeping there
+CONTENT_CACHE_SIZE = 64
+CONTENT_CACHE_MAX_FILE = 1 << 20
+
+# LRU of (path, stripped) -> ((mtime_ns, size) when read, decoded text)
+_content_cache: OrderedDict[tuple[str, bool], tuple[tuple[int, int], str]] = OrderedDict()
+
 class DocumentGeneratorSchema(BaseModel):
     """Pydantic model for documentation filename schema.
 
@@ -30,8 +84,10 @@ mcp = FastMCP("File Operations MCP Server")
 def get_path(relative_path: str) -> Path:
     """Convert relative path to absolute path within project directory.
 
-    Ensures the path is within BASE_DIR for security. Resolves the path
-    and validates it's relative to the base directory.
+    Ensures the path is within BASE_DIR for security. The path is joined to
+    BASE_DIR and normalized as a string, so validation costs no filesystem
+    calls. Symlinks are not resolved here; ensure_contained does that right
+    before a file is opened, created, copied or unlinked.
 
     Args:
         relative_path: Relative path string to convert
@@ -42,11 +98,324 @@ def get_path(relative_path: str) -> Path:
     Raises:
         ValueError: If path is outside base directory
     """
-    try:
-        rel = Path(relative_path).resolve().relative_to(BASE_DIR)
-        return rel
-    except ValueError:
+    path = os.path.normpath(os.path.join(BASE_DIR_STR, relative_path))
+    if path != BASE_DIR_STR and not path.startswith(BASE_DIR_PREFIX):
         raise ValueError("Path is outside BASE_DIR")
+    return Path(path)
+
+
+def ensure_contained(path: Path) -> None:
+    """Check that a path stays within BASE_DIR once symlinks are resolved.
+
+    Must be called at the site that opens, creates, copies or unlinks the
+    path, so a symlink inside the project can't lead outside of it.
+
+    Args:
+        path: Path returned by get_path
+
+    Raises:
+        ValueError: If the resolved path is outside base directory
+    """
+    real = os.path.realpath(path)
+    if os.path.commonpath([BASE_DIR_REAL, real]) != BASE_DIR_REAL:
+        raise ValueError("Path is outside BASE_DIR")
+
+
+def iter_dir_items(path: Path, start: int = 0, stop: int | None = None) -> Iterator[dict]:
+    """Yield metadata for each entry of a directory.
+
+    Entries are produced lazily from os.scandir, which reuses the file type
+    from the directory read and caches each entry's stat result. Where the
+    platform supports it the directory is scanned through an open file
+    descriptor, so each entry is stat-ed relative to it instead of by
+    resolving its full path again.
+
+    Entries before start are skipped without being stat-ed, so a slice of
+    the listing only pays for the entries it returns.
+
+    Args:
+        path: Directory to list
+        start: Index of the first entry to yield
+        stop: Index to stop before, or None to read to the end
+
+    Yields:
+        Dictionary with name, path, type, size, and timestamps of an entry
+    """
+    parent = os.path.relpath(path, BASE_DIR)
+    prefix = "" if parent == os.curdir else parent + os.sep
+    if not SCANDIR_FD:
+        yield from _scan_items(path, prefix, start, stop)
+        return
+
+    dir_fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        yield from _scan_items(dir_fd, prefix, start, stop)
+    finally:
+        os.close(dir_fd)
+
+
+def _scan_items(target, prefix: str, start: int, stop: int | None) -> Iterator[dict]:
+    """Yield metadata for a slice of the entries of an os.scandir target.
+
+    Args:
+        target: Directory path or open directory file descriptor
+        prefix: Relative path prepended to each entry name
+        start: Index of the first entry to yield
+        stop: Index to stop before, or None to read to the end
+
+    Yields:
+        Dictionary with name, path, type, size, and timestamps of an entry
+    """
+    with os.scandir(target) as entries:
+        for entry in islice(entries, start, stop):
+            # Symlinks are reported as their targets, as Path.iterdir listings
+            # did; a dangling link falls back to the link's own metadata
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                st = entry.stat(follow_symlinks=False)
+            modified = datetime.fromtimestamp(st.st_mtime).isoformat()
+            # Most entries were last changed when they were written, so reuse
+            # the formatted string instead of formatting the same time twice
+            if st.st_ctime == st.st_mtime:
+                created = modified
+            else:
+                created = datetime.fromtimestamp(st.st_ctime).isoformat()
+            yield {
+                "name": entry.name,
+                "path": prefix + entry.name,
+                "type": "directory" if entry.is_dir() else "file",
+                "size": st.st_size,
+                "modified": modified,
+                "created": created,
+            }
+
+
+def read_file_text(path: Path, strip: bool = False) -> str:
+    """Read a UTF-8 text file with a single open and, usually, a single read.
+
+    The file is sized with fstat on the open descriptor and read in one
+    call, instead of the separate open, stat and read calls made by
+    Path.read_text. Newlines are normalized the same way as text mode.
+
+    Args:
+        path: Path of the file to read
+        strip: Whether to strip leading and trailing whitespace
+
+    Returns:
+        The decoded file content
+
+    Raises:
+        ValueError: If the path resolves outside base directory
+    """
+    ensure_contained(path)
+    try:
+        fd = os.open(path, READ_FLAGS | NOATIME_FLAG)
+    except PermissionError:
+        if not NOATIME_FLAG:
+            raise
+        fd = os.open(path, READ_FLAGS)
+
+    try:
+        size = os.fstat(fd).st_size
+        parts = [os.read(fd, size)] if size else []
+        # Keep reading past the reported size in case of short reads, files
+        # that grew since fstat, or special files that report size 0
+        while chunk := os.read(fd, 1 << 16):
+            parts.append(chunk)
+    finally:
+        os.close(fd)
+
+    text = b"".join(parts).decode('utf-8')
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    # str.strip, unlike bytes.strip, also removes Unicode whitespace
+    return text.strip() if strip else text
+
+
+def open_for_write(path: Path) -> int:
+    """Open a file for writing, creating it and its parent directories.
+
+    Args:
+        path: Path of the file to create or truncate
+
+    Returns:
+        File descriptor open for writing
+
+    Raises:
+        ValueError: If the path resolves outside base directory
+    """
+    ensure_contained(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return os.open(path, WRITE_FLAGS, 0o666)
+
+
+def unlink_file(path: Path) -> None:
+    """Unlink a file once its resolved path is known to be inside BASE_DIR.
+
+    Args:
+        path: Path of the file to delete
+
+    Raises:
+        ValueError: If the path resolves outside base directory
+    """
+    ensure_contained(path)
+    os.unlink(path)
+
+
+def write_all(fd: int, data: memoryview) -> None:
+    """Write a whole buffer to a file descriptor.
+
+    os.write may write fewer bytes than requested, so it is called again
+    for the remainder until everything is written.
+
+    Args:
+        fd: Open file descriptor to write to
+        data: Bytes to write
+    """
+    offset = 0
+    while offset < len(data):
+        offset += os.write(fd, data[offset:])
+
+
+def copy_file_contents(source: Path, destination: Path) -> None:
+    """Copy a file's content, letting the kernel move the data where possible.
+
+    Uses os.copy_file_range (Linux) so the bytes never pass through user
+    space, and falls back to shutil for other platforms or filesystems that
+    don't support it. Parent directories of the destination are created.
+
+    Args:
+        source: Path of the file to copy
+        destination: Path of the file to create or overwrite
+
+    Raises:
+        ValueError: If either path resolves outside base directory
+        shutil.SameFileError: If source and destination are the same file
+    """
+    ensure_contained(source)
+    ensure_contained(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+
+    if not hasattr(os, "copy_file_range"):
+        shutil.copyfile(source, destination)
+        return
+
+    # Opening the destination truncates it, which would empty the source
+    if os.path.exists(destination) and os.path.samefile(source, destination):
+        raise shutil.SameFileError(f"{source} and {destination} are the same file")
+
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        try:
+            while os.copy_file_range(src.fileno(), dst.fileno(), COPY_CHUNK_SIZE):
+                pass
+        except OSError:
+            # Unsupported between these filesystems; finish with a regular
+            # copy from wherever copy_file_range stopped
+            shutil.copyfileobj(src, dst)
+
+
+async def cached_stat(path: Path) -> os.stat_result | None:
+    """Stat a path, reusing a recent result for the same path.
+
+    Results, including missing paths, are cached for STAT_CACHE_TTL seconds
+    in a bounded LRU so handlers hit by consecutive requests on the same file
+    skip the syscall. Handlers that change the filesystem must call
+    invalidate_stat for the paths they touch.
+
+    Args:
+        path: Path to stat (symlinks are followed)
+
+    Returns:
+        The stat result, or None if the path doesn't exist
+    """
+    key = str(path)
+    now = time.monotonic()
+    cached = _stat_cache.get(key)
+    if cached is not None and now - cached[0] < STAT_CACHE_TTL:
+        _stat_cache.move_to_end(key)
+        return cached[1]
+
+    try:
+        st = await asyncio.to_thread(os.stat, path)
+    except (FileNotFoundError, NotADirectoryError):
+        st = None
+
+    _stat_cache[key] = (now, st)
+    _stat_cache.move_to_end(key)
+    if len(_stat_cache) > STAT_CACHE_SIZE:
+        _stat_cache.popitem(last=False)
+    return st
+
+
+async def _stat_regular(path: Path) -> os.stat_result | None:
+    """Stat a path with a single (cached) call and check it is a regular file.
+
+    Args:
+        path: Path to check
+
+    Returns:
+        The stat result, or None if the path is missing or not a regular file
+    """
+    st = await cached_stat(path)
+    if st is None or not stat.S_ISREG(st.st_mode):
+        return None
+    return st
+
+
+def invalidate_stat(path: Path) -> None:
+    """Drop the cached stat result for a path.
+
+    Args:
+        path: Path whose cached metadata is stale
+    """
+    _stat_cache.pop(str(path), None)
+
+
+async def read_file_cached(path: Path, st: os.stat_result, strip: bool = False) -> str:
+    """Read a text file, reusing the decoded content if the file is unchanged.
+
+    The modification time and size from the caller's stat result are
+    compared with the cached copy, so no extra stat is made; with a result
+    from cached_stat, edits made outside the server are picked up once that
+    entry expires. Files larger than CONTENT_CACHE_MAX_FILE are never cached.
+
+    Args:
+        path: Path of the file to read
+        st: Stat result of the file, as returned by _stat_regular
+        strip: Whether to strip leading and trailing whitespace
+
+    Returns:
+        The decoded file content
+    """
+    key = (str(path), strip)
+    version = (st.st_mtime_ns, st.st_size)
+
+    cached = _content_cache.get(key)
+    if cached is not None and cached[0] == version:
+        _content_cache.move_to_end(key)
+        return cached[1]
+
+    text = await asyncio.to_thread(read_file_text, path, strip)
+    if st.st_size <= CONTENT_CACHE_MAX_FILE:
+        _content_cache[key] = (version, text)
+        _content_cache.move_to_end(key)
+        if len(_content_cache) > CONTENT_CACHE_SIZE:
+            _content_cache.popitem(last=False)
+    else:
+        _content_cache.pop(key, None)
+    return text
+
+
+def invalidate_content(path: Path) -> None:
+    """Drop the cached content of a file.
+
+    Args:
+        path: Path of the file that was written or deleted
+    """
+    key = str(path)
+    _content_cache.pop((key, False), None)
+    _content_cache.pop((key, True), None)
 
 # ============================================================================
 # TOOLS
@@ -73,21 +442,32 @@ async def write_file(file_path: str, content: str, ctx: Context) -> str:
     """
     try:
         path = get_path(file_path)
-        # Create parent directories if they don't exist
-        path.parent.mkdir(parents=True, exist_ok=True)
-
-        total = len(content)
-        chunk_size = max(total // 10, 1)
-
-        # Write content with UTF-8 encoding with progress reporting
-        written = 0
-        with open(path, "w", encoding='utf-8') as f:
-            for i in range(0, total, chunk_size):
-                f.write(content[i:i+chunk_size])
-                written = min(i+chunk_size, total)
-                await ctx.report_progress(progress=written, total=total, message=f"Writing progress: {written}/{total}")
-                time.sleep(0.05)
-        
+        data = memoryview(content.encode('utf-8'))
+        total = len(data)
+
+        # Write the UTF-8 bytes straight to the descriptor, creating parent
+        # directories if they don't exist; only large writes are split into
+        # chunks so progress can be reported along the way
+        try:
+            fd = await asyncio.to_thread(open_for_write, path)
+            try:
+                if total <= PROGRESS_WRITE_THRESHOLD:
+                    await asyncio.to_thread(write_all, fd, data)
+                else:
+                    chunk_size = max(total // 10, 1)
+                    for i in range(0, total, chunk_size):
+                        await asyncio.to_thread(write_all, fd, data[i:i+chunk_size])
+                        written = min(i+chunk_size, total)
+                        await ctx.report_progress(progress=written, total=total, message=f"Writing progress: {written}/{total}")
+            finally:
+                os.close(fd)
+        finally:
+            # The file and possibly some of its parent directories now exist,
+            # and a failed write may already have truncated the file
+            for written_path in (path, *path.parents):
+                invalidate_stat(written_path)
+            invalidate_content(path)
+
         await ctx.report_progress(progress=total, total=total, message="Write complete")
         await ctx.info(f"File written successfully to: {file_path}")
         return f"File written successfully to: {file_path}"
@@ -100,7 +480,9 @@ async def write_file(file_path: str, content: str, ctx: Context) -> str:
 async def delete_file(file_path: str, ctx: Context) -> str:
     """Delete a file from the project directory.
 
-    Validates that the path points to a file (not a directory) before deletion.
+    Unlinks the path directly and lets the operating system reject
+    directories and missing files, so there is no separate check that could
+    go stale before the deletion.
 
     Args:
         file_path: Relative path to the file to delete
@@ -111,21 +493,75 @@ async def delete_file(file_path: str, ctx: Context) -> str:
     """
     try:
         path = get_path(file_path)
-        # Check if path exists and is a file
-        if path.is_file():
-            path.unlink()
-            await ctx.info(f"Successfully deleted file {file_path}")
-            return f"Successfully deleted file {file_path}"
-        elif path.is_dir():
+        try:
+            await asyncio.to_thread(unlink_file, path)
+        except IsADirectoryError:
             await ctx.warning(f"Error: {file_path} is a directory, not a file")
             return f"Error: {file_path} is a directory, not a file"
-        else:
+        except PermissionError:
+            # Some platforms (e.g. macOS) report EPERM instead of EISDIR
+            if not await asyncio.to_thread(path.is_dir):
+                raise
+            await ctx.warning(f"Error: {file_path} is a directory, not a file")
+            return f"Error: {file_path} is a directory, not a file"
+        except FileNotFoundError:
+            invalidate_stat(path)
+            invalidate_content(path)
             await ctx.warning(f"File not found: {file_path}")
             return f"File not found: {file_path}"
+
+        invalidate_stat(path)
+        invalidate_content(path)
+        await ctx.info(f"Successfully deleted file {file_path}")
+        return f"Successfully deleted file {file_path}"
     except Exception as e:
         await ctx.error(f"Error deleting file: {str(e)}")
         return f"Error deleting file: {str(e)}"
 
+@mcp.tool()
+async def copy_file(source_path: str, destination_path: str, ctx: Context) -> str:
+    """Copy a file to another path in the project directory.
+
+    Creates parent directories of the destination if they don't exist and
+    overwrites an existing destination file. The data is copied by the
+    kernel where supported instead of being read into the server.
+
+    Args:
+        source_path: Relative path of the file to copy
+        destination_path: Relative path where the copy should be created
+        ctx: MCP context for logging
+
+    Returns:
+        Success or error message describing the operation result
+
+    Raises:
+        Exception: If copying fails (logged to context)
+    """
+    try:
+        source = get_path(source_path)
+        destination = get_path(destination_path)
+
+        # Validate source exists and is a file
+        if await _stat_regular(source) is None:
+            await ctx.warning(f"File not found: {source_path}")
+            return f"File not found: {source_path}"
+
+        # Parent directories of the destination are created if they don't exist
+        try:
+            await asyncio.to_thread(copy_file_contents, source, destination)
+        finally:
+            # The copy and possibly some of its parent directories now exist,
+            # and a failed copy may already have truncated the destination
+            for copied_path in (destination, *destination.parents):
+                invalidate_stat(copied_path)
+            invalidate_content(destination)
+
+        await ctx.info(f"File copied successfully to: {destination_path}")
+        return f"File copied successfully to: {destination_path}"
+    except Exception as e:
+        await ctx.error(f"Error copying file: {str(e)}")
+        raise
+
 # ============================================================================
 # RESOURCES
 # ============================================================================
@@ -147,17 +583,43 @@ async def read_file_resource(file_name: str) -> dict:
         path = get_path(file_name)
 
         # Validate path exists and is a file
-        if not path.exists() or not path.is_file():
+        st = await _stat_regular(path)
+        if st is None:
             error_msg = f"Error: {file_name} is not a valid file"
             return {"error": error_msg}
         # Read and return file content
-        return {"file_content": path.read_text(encoding='utf-8')}
+        return {"file_content": await read_file_cached(path, st)}
 
     except Exception as e:
         return {"error": f"Error reading file: {str(e)}"}
 
 
 
+@mcp.resource("file-raw:///{file_name}", mime_type="text/plain")
+async def read_file_raw_resource(file_name: str) -> str:
+    """Read the raw content of a file as an MCP resource.
+
+    Same as read_file_resource but returns the file text itself instead of
+    a JSON envelope, so clients can use it without parsing.
+
+    Args:
+        file_name: Relative path to the file to read
+
+    Returns:
+        The file content
+
+    Raises:
+        FileNotFoundError: If the specified file doesn't exist
+    """
+    path = get_path(file_name)
+
+    # Validate path exists and is a file
+    st = await _stat_regular(path)
+    if st is None:
+        raise FileNotFoundError(f"Error: {file_name} is not a valid file")
+    return await read_file_cached(path, st)
+
+
 @mcp.resource("dir://.")
 async def list_files_resource() -> dict:
     """List files and directories in the current directory as an MCP resource.
@@ -171,24 +633,58 @@ async def list_files_resource() -> dict:
     """
     try:
         path = get_path(".")
-        if not path.exists() or not path.is_dir():
+        st = await cached_stat(path)
+        if st is None or not stat.S_ISDIR(st.st_mode):
             return {"error": f"{path} is not a valid directory"}
 
-        # Collect directory items with metadata
-        items = []
-        for item in path.iterdir():
-            stat = item.stat()
-            items.append({
-                "name": item.name,
-                "path": str(item.relative_to(BASE_DIR)),
-                "type": "directory" if item.is_dir() else "file",
-                "size": stat.st_size,
-                "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                "created": datetime.fromtimestamp(stat.st_ctime).isoformat(),
-            })
+        return {
+            "items": await asyncio.to_thread(lambda: list(iter_dir_items(path)))
+        }
+    except Exception as e:
+        return {"error": f"Error listing files: {e}"}
+
+
+@mcp.resource("dir://./page/{page}")
+async def list_files_page_resource(page: str) -> dict:
+    """List one page of the current directory as an MCP resource.
+
+    Same metadata as list_files_resource, but only the LISTING_PAGE_SIZE
+    items of the requested page are stat-ed and returned, so large
+    directories never have to be materialized in full. Earlier entries are
+    only skipped over. Pages are numbered from 0.
+
+    Pages are offsets into the order the filesystem returns entries in,
+    which is not sorted and is not guaranteed to stay the same between
+    calls; if the directory changes while it is being paged through,
+    entries can be skipped or returned twice.
+
+    Args:
+        page: Index of the page to return
+
+    Returns:
+        Dictionary containing the page items and the next page index
+        (None on the last page), or error message
+    """
+    try:
+        index = int(page)
+        if index < 0:
+            return {"error": f"Invalid page: {page}"}
+
+        path = get_path(".")
+        st = await cached_stat(path)
+        if st is None or not stat.S_ISDIR(st.st_mode):
+            return {"error": f"{path} is not a valid directory"}
+
+        # Skip earlier pages and read one entry past this one to detect the end
+        start = index * LISTING_PAGE_SIZE
+        items = await asyncio.to_thread(
+            lambda: list(iter_dir_items(path, start, start + LISTING_PAGE_SIZE + 1))
+        )
+        has_more = len(items) > LISTING_PAGE_SIZE
 
         return {
-            "items": items
+            "items": items[:LISTING_PAGE_SIZE],
+            "next_page": index + 1 if has_more else None,
         }
     except Exception as e:
         return {"error": f"Error listing files: {e}"}
@@ -197,6 +693,33 @@ async def list_files_resource() -> dict:
 # PROMPTS
 # ============================================================================
 
+# Prompt templates, filled in with str.format by the prompt handlers
+CODE_REVIEW_TEMPLATE = """You are an expert code editor. Review the following code quality.
+
+File: {file_path}
+Language (file suffix): {language}
+
+Current code:
+'''
+{code}
+'''
+
+Provide a comprehensive evaluation of the code:"""
+
+DOCUMENTATION_TEMPLATE = """You are an expert technical writer and documentation specialist. Create documentation for the following code file:
+
+File: {file_path}
+Language (file suffix): {language}
+
+Current code:
+'''
+{code}
+'''
+
+Use MCP tools available to you to create the separate documentation file:
+- **CRITICAL DETAIL: Name that separate document EXACTLY: {doc_name}**
+- Add the .md suffix yourself if the name doesn't include it already"""
+
 @mcp.prompt()
 async def code_review(file_path: str, ctx: Context) -> str:
     """Generate a prompt for code review and quality evaluation.
@@ -218,29 +741,22 @@ async def code_review(file_path: str, ctx: Context) -> str:
         path = get_path(file_path)
 
         # Validate file exists
-        if not path.exists() or not path.is_file():
+        st = await _stat_regular(path)
+        if st is None:
             error_msg = f"Error: {file_path} is not a valid file"
             await ctx.warning(error_msg)
             raise FileNotFoundError(error_msg)
         
         # Read code and detect language from extension
-        current_code = path.read_text(encoding='utf-8').strip()
+        current_code = await read_file_cached(path, st, strip=True)
         language = path.suffix.lower()
 
         # Generate structured prompt for code review
-        prompt = f"""You are an expert code editor. Review the following code quality.
-
-File: {file_path}
-Language (file suffix): {language or "unknown"}
-
-Current code:
-'''
-{current_code}
-'''
-
-Provide a comprehensive evaluation of the code:
-
-""".strip()
+        prompt = CODE_REVIEW_TEMPLATE.format(
+            file_path=file_path,
+            language=language or "unknown",
+            code=current_code,
+        )
         await ctx.info("Successfully returned prompt")
         return prompt
 
@@ -276,31 +792,25 @@ async def documentation_generator(ctx: Context) -> str:
         path = get_path(file_path)
 
         # Validate file exists
-        if not path.exists() or not path.is_file():
+        st = await _stat_regular(path)
+        if st is None:
             error_msg = f"Error: {file_path} is not a valid file"
             await ctx.warning(error_msg)
             raise FileNotFoundError(error_msg)
 
         # Read code and detect language from extension
-        code = path.read_text(encoding='utf-8').strip()
+        code = await read_file_cached(path, st, strip=True)
         language = path.suffix.lower()
 
         doc_name = result.data.name
 
         # Generate structured prompt for documentation creation
-        prompt = f"""You are an expert technical writer and documentation specialist. Create documentation for the following code file:
-
-File: {file_path}
-Language (file suffix): {language or "unknown"}
-
-Current code:
-'''
-{code}
-'''
-
-Use MCP tools available to you to create the separate documentation file:
-- **CRITICAL DETAIL: Name that separate document EXACTLY: {doc_name}**
-- Add the .md suffix yourself if the name doesn't include it already""".strip()
+        prompt = DOCUMENTATION_TEMPLATE.format(
+            file_path=file_path,
+            language=language or "unknown",
+            code=code,
+            doc_name=doc_name,
+        )
 
         await ctx.info("Successfully returned prompt")
         return prompt